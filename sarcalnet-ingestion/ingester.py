@@ -1,12 +1,16 @@
-import math
+import base64
+import datetime
+import importlib.util
+import json
 import os
-import string
-import urllib
-import random
-from typing import Optional, List
-
-import dateutil.parser
 import re
+import tempfile
+import threading
+import time
+import urllib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, List, Tuple
 
 import click
 import numpy as np
@@ -17,9 +21,18 @@ import requests
 import shapely
 
 from pandas import DataFrame
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
+from xcube_geodb.core.error import GeoDBError
 from xcube_geodb.core.geodb import GeoDBClient
 
+# python-calamine reads workbooks considerably faster than openpyxl
+if importlib.util.find_spec("python_calamine"):
+    EXCEL_ENGINE = "calamine"
+else:
+    EXCEL_ENGINE = "openpyxl"
+
 
 DATABASE = "sarcalnet"
 
@@ -29,31 +42,304 @@ NAT_TARGETS_COLLECTION = "calibration_nat_targets_dev"
 SURVEYS_COLLECTION = "calibration_surveys_dev"
 NAT_SURVEYS_COLLECTION = "calibration_nat_surveys_dev"
 
+UPLOAD_WORKERS = 8
+INSERT_CHUNK_SIZE = 500
+
+# the column headings of the template sheets, mapped to the database fields
+SITE_COLUMNS = {
+    "Short Site ID": "short_site_identifier",
+    "Country": "country",
+    "Site Name": "sitename",
+    "Province / state / region": "province_state_region",
+    "Primary Target Type ID": "primary_target_type_identifier",
+    "Target Types": "target_types",
+    "Primary Sensor": "primary_sensor",
+    "Willing to consider special requests": "special_requests",
+    "Responsible Organization": "responsible_organization",
+    "Website": "website",
+    "Active from  (YYYY-MM-DD)": "active_from",
+    "Active from (YYYY-MM-DD)": "active_from",
+    'Active until (YYYY-MM-DD or "-")': "active_until",
+    "POC Name": "poc_name",
+    "POC email": "poc_mail",
+    "Additional POC Name": "poc2_name",
+    "Additional POC email": "poc2_mail",
+    "Centroid of the site (latitude and longitude in decima deg)": "centroid",
+    "Boundaries": "boundaries",
+    "Planned maintenance schedule": "maintenance_schedule",
+    "Characteristics": "characteristics",
+}
+
+NAT_TARGET_COLUMNS = {
+    "Unique Target ID": "unique_target_id",
+    "Short Site ID": "short_site_identifier",
+    "Site Name": "sitename",
+    "Sub-site": "subsite",
+    "Internal ID": "internal_id",
+    "Short Target ID": "short_target_id",
+    "Target Type ID": "target_type_id",
+    "Target description": "target_description",
+    "Bounding polygon (WKT, WGS84)": "geometry",
+    "Coverage (km2)": "coverage",
+    "Mask polygon (WKT, WGS84)": "mask_polygon",
+    "Start Monitoring Period (YYYY-MM-DD)": "period_start",
+    'Stop Monitoring Period (YYYY-MM-DD or "-")': "period_stop",
+}
+
+ART_TARGET_COLUMNS = {
+    "Unique Target ID": "unique_target_id",
+    "Short Site ID": "short_site_identifier",
+    "Site Name": "sitename",
+    "Sub-site": "subsite",
+    "Internal ID": "internal_id",
+    "Short Target ID": "short_target_id",
+    "Target Type ID": "target_type_id",
+    "Target description": "target_description",
+    "Approximage Latitude\n(decimal deg, WGS84)": "apprx_latitude",
+    "Approximate Latitude\n(decimal deg, WGS84)": "apprx_latitude",
+    "Approximate Longitude\n(decimal deg WGS84)": "apprx_longitude",
+    "Approximate Longitude\n(decimal deg, WGS84)": "apprx_longitude",
+    "Approximate elevation\n(meters, WGS84)": "apprx_elevation",
+    "Approximate Azimuth angle\n(decimal deg)": "apprx_azimuth",
+    "Approximate Boresight angle\n(decimal deg)": "apprx_boresight",
+    "Primary direction": "primary_direction",
+    "Side length (m)": "side_length",
+    "Photo link": "photo_link",
+    "Operational": "operational",
+    "Manufacturer": "manufacturer",
+    "Purpose of target": "purpose",
+    "Reference RCS (dBm2)": "rcs",
+    "Reference RCS measurement sensor": "rcs_sensor",
+    "Reference RCS measurement expected accuracy (dB)": "rcs_accuracy",
+    "Reference RCS measurement boresite angle (decimal deg)": "rcs_angle",
+    "Reference RCS measurement wavelength (m)": "rcs_wavelength",
+    "Reference RCS measurement bandwidth (Hz)": "rcs_bandwidth",
+    "RCS accuracy determination method": "rcs_method",
+    "RCS angle dependency availablity": "rcs_angle_dependency",
+    "Composition": "composition",
+    "Characterization of reflector ": "characterization",
+    "Characterization of reflector": "characterization",
+}
+
+NAT_SURVEY_COLUMNS = {
+    "Unique Target ID": "unique_target_id",
+    "Start Survey Period (YYYY-MM-DD)": "survey_start",
+    "Stop Survey Period (YYYY-MM-DD)": "survey_stop",
+    "Mission": "mission",
+    "Carrier Frequency (GHz)": "carrier_frequency",
+    "Polarization Channels": "polarization_channels",
+    "UTC Observation Time (HH:MM)": "observation_time_utc",
+    "Local Observation time (HH:MM)": "observation_time_local",
+    "Incidence Angle Range (min - max, in decimal deg)": "incidence_angle_range",
+    "Backscatter coefficient type": "backscatter_coefficient_type",
+    "Mean Backscatter Coefficient (dB)": "backscatter_coefficient_mean",
+    "Backscatter Coefficient Standard Deviation (dB)": "backscatter_coefficient_std",
+    "Reference Surface": "reference_surface",
+    "Samples": "samples",
+    "Relative Orbit": "relative_orbit",
+    "Orbit direction": "orbit_direction",
+    "Look side": "look_side",
+    "Acquisition Mode": "acquisition_mode",
+    "Beam ID": "beam_id",
+    "Scene identifier(s)": "scene_identifier",
+    "Query URL": "query_url",
+}
+
+ART_SURVEY_COLUMNS = {
+    "Unique Target ID": "unique_target_id",
+    "Survey date (YYYY-MM-DD)": "survey_date",
+    "Latitude (decimal deg)": "lat",
+    "Longitude (decimal deg)": "lon",
+    "Elevation (m)": "elevation",
+    "Position accuracy (cm)": "position_accuracy",
+    "Coordinate Reference System (WKT or EPSG)": "coordinate_reference_system",
+    "Azimuth angle\n(decimal deg)": "azimuth_angle",
+    "Boresight angle\n(decimal deg)": "boresight_angle",
+    "Tilt (decimal deg)": "tilt",
+    "Pointing accuracy\n(decimal deg)": "accuracy",
+    "Fence": "fence",
+    "Measurement method": "measurement_method",
+    "Offset method": "offset_method",
+    "Applied corrections": "corrections",
+    "GNSS measusement duration\n(hh:mm:ss)": "duration",
+    "GNSS measurement duration\n(hh:mm:ss)": "duration",
+    "Photo link": "photo_link",
+    "Status report": "status_report",
+}
+
+# the fields of the artificial target surveys which must be numbers
+ART_SURVEY_NUMERIC_FIELDS = [
+    "lat",
+    "lon",
+    "elevation",
+    "position_accuracy",
+    "azimuth_angle",
+    "boresight_angle",
+    "tilt",
+    "accuracy",
+]
+
+# a centroid given as comma-separated lat and lon, e.g. "36.578, 120.356"
+CENTROID_LAT_LON = re.compile(r"\s*-?\d+(\.\d*)?\s*,\s*-?\d+(\.\d*)?\s*")
+
+TOKEN_CACHE_FILE = os.path.join(
+    os.path.expanduser("~"), ".cache", "sarcalnet-ingestion", "tokens.json"
+)
+# cached tokens which expire sooner are not used
+TOKEN_MIN_LIFETIME = 60 * 60
+
+
+def compute_centroids(sites_df: DataFrame, boundaries: gpd.GeoSeries) -> DataFrame:
+    centroids = sites_df["centroid"].copy()
+    centroid_texts = centroids.astype(str)
+    missing = centroids.isna() | (centroids == "")
+    lat_lon = ~missing & centroid_texts.str.fullmatch(CENTROID_LAT_LON)
+    wkt = ~missing & ~lat_lon & centroid_texts.str.upper().str.startswith("POINT")
+    invalid = ~(missing | lat_lon | wkt)
+    if invalid.any():
+        raise ValueError(
+            f"Invalid value for field 'centroid' in row {invalid.idxmax() + 6}. "
+            f"Please either provide a position given by comma-separated "
+            f"lat and lon values (e.g. 36.578, 120.356), or provide the "
+            f"position as WKT (e.g. POINT(120.356 36.578)), or leave the "
+            f"field empty, so the centroid is computed from the boundaries.\n"
+            f"No sites not targets have been ingested."
+        )
 
-def compute_centroid_from_boundaries(row):
-    if (isinstance(row["centroid"], str) and not row["centroid"]) or (
-        isinstance(row["centroid"], float) and math.isnan(row["centroid"])
+    centroids[missing] = shapely.to_wkt(
+        shapely.centroid(boundaries[missing].to_numpy()), rounding_precision=-1
+    )
+    lat_lon_parts = centroid_texts[lat_lon].str.split(",")
+    lat = lat_lon_parts.str[0].str.strip()
+    lon = lat_lon_parts.str[1].str.strip()
+    centroids[lat_lon] = "POINT(" + lon + " " + lat + ")"
+    return sites_df.assign(centroid=centroids)
+
+
+def find_missing_field(
+    df: DataFrame, mandatory_fields: List[str]
+) -> Optional[Tuple[int, str]]:
+    missing = df[mandatory_fields].isna()
+    incomplete_rows = missing.any(axis=1)
+    if not incomplete_rows.any():
+        return None
+    row = incomplete_rows.idxmax()
+    return row, missing.loc[row].idxmax()
+
+
+def format_duration(duration) -> str:
+    # openpyxl and calamine read cells formatted as elapsed time as timedelta,
+    # but turn it into text differently, so it is formatted here as H:MM:SS
+    if isinstance(duration, datetime.timedelta):
+        seconds = round(duration.total_seconds())
+        return f"{seconds // 3600}:{seconds // 60 % 60:02}:{seconds % 60:02}"
+    return str(duration)
+
+
+def parse_date(date) -> Optional[datetime.datetime]:
+    try:
+        return datetime.datetime.fromisoformat(str(date))
+    except ValueError:
+        return None
+
+
+def parse_dates(dates: pd.Series) -> pd.Series:
+    # entries that are not a date (or date and time) become NaT or None
+    parsed = pd.to_datetime(dates, errors="coerce", format="ISO8601")
+    # dates beyond the range of pandas timestamps, like 9999-12-31, are valid
+    # nonetheless, so only the entries which failed are checked once more
+    failed = parsed.isna() & dates.notna()
+    if not failed.any():
+        return parsed
+    parsed = parsed.astype(object)
+    parsed[failed] = dates[failed].map(parse_date)
+    return parsed
+
+
+def replace_missing(
+    df: DataFrame, nan_value=None, placeholder: Optional[str] = None
+) -> DataFrame:
+    # replaces NaN with nan_value, and the placeholder of optional fields with
+    # None, using masks over a single copy of the values instead of replace()
+    values = df.to_numpy(dtype=object, copy=True)
+    missing = pd.isna(values)
+    if placeholder is not None:
+        values[values == placeholder] = None
+    values[missing] = nan_value
+    # keep the values as they are; inferring dtypes again would turn None back
+    # into NaN or NaT, e.g. in columns holding dates
+    return DataFrame(values, index=df.index, columns=df.columns, dtype=object)
+
+
+def read_token_cache() -> dict:
+    try:
+        with open(TOKEN_CACHE_FILE) as f:
+            tokens = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return tokens if isinstance(tokens, dict) else {}
+
+
+def get_token_expiry(access_token: str) -> Optional[float]:
+    # the token is a JWT; its payload carries the expiry time in the 'exp' claim
+    try:
+        payload = access_token.split(".")[1]
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+        return float(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def get_cached_access_token(cache_key: str) -> Optional[str]:
+    entry = read_token_cache().get(cache_key)
+    # the cache is only a shortcut, entries of unexpected shape are ignored
+    if (
+        not isinstance(entry, dict)
+        or not isinstance(entry.get("access_token"), str)
+        or not isinstance(entry.get("expires_at"), (int, float))
     ):
-        polygon = shapely.from_wkt(row["boundaries"])
-        row["centroid"] = shapely.centroid(polygon).wkt
-        return row
-    else:
-        if re.search(r"\s*-?\d+.\d*\s*,\s*-?\d+.\d*\s*", str(row["centroid"])):
-            lat = row["centroid"].split(",")[0].strip()
-            lon = row["centroid"].split(",")[1].strip()
-            row["centroid"] = f"POINT({lon} {lat})"
-            return row
-        elif str(row["centroid"]).upper().startswith("POINT"):
-            return row
-        else:
-            raise ValueError(
-                f"Invalid value for field 'centroid' in row {row.name + 6}. "
-                f"Please either provide a position given by comma-separated "
-                f"lat and lon values (e.g. 36.578, 120.356), or provide the "
-                f"position as WKT (e.g. POINT(120.356 36.578)), or leave the "
-                f"field empty, so the centroid is computed from the boundaries.\n"
-                f"No sites not targets have been ingested."
-            )
+        return None
+    # the client never refreshes a token it was given, so the token must outlast
+    # the whole ingestion, including the photo uploads
+    if entry["expires_at"] > time.time() + TOKEN_MIN_LIFETIME:
+        return entry["access_token"]
+    return None
+
+
+def cache_access_token(cache_key: str, access_token: str):
+    expires_at = get_token_expiry(access_token)
+    if expires_at is None:
+        return
+    tokens = read_token_cache()
+    tokens[cache_key] = {"access_token": access_token, "expires_at": expires_at}
+    write_token_cache(tokens)
+
+
+def drop_cached_access_token(cache_key: str):
+    tokens = read_token_cache()
+    if tokens.pop(cache_key, None) is not None:
+        write_token_cache(tokens)
+
+
+def write_token_cache(tokens: dict):
+    cache_dir = os.path.dirname(TOKEN_CACHE_FILE)
+    # a home directory which cannot be written to must not abort the ingestion
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # write to a private temporary file first, so concurrent runs never read
+        # a partially written cache
+        fd, tmp_file = tempfile.mkstemp(dir=cache_dir)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(tokens, f)
+            os.replace(tmp_file, TOKEN_CACHE_FILE)
+        except OSError:
+            os.remove(tmp_file)
+            raise
+    except OSError as e:
+        print(f"Could not cache the access token: {e}")
 
 
 class Ingester:
@@ -74,6 +360,26 @@ class Ingester:
         self.auth_audience = auth_audience
         self.admin_password = admin_password
         self.filebird_token = filebird_token
+        # built once and shared by all requests to the website
+        self.wordpress_auth = HTTPBasicAuth("thomas", admin_password)
+        self.filebird_headers = {"Authorization": f"Bearer {filebird_token}"}
+        self.workbooks = {}
+        self.folder_ids = None
+        self.folder_ids_lock = threading.Lock()
+        self.photo_urls = {}
+        # keep connections to the website alive, one per concurrent upload, and
+        # retry on connection errors and on gateway errors for idempotent requests
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=UPLOAD_WORKERS,
+                pool_maxsize=UPLOAD_WORKERS,
+                max_retries=Retry(
+                    total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504)
+                ),
+            ),
+        )
 
         if (
             not client_id
@@ -85,16 +391,47 @@ class Ingester:
         else:
             self.validation_mode = False
 
+        self.token_cache_key = f"{client_id}@{server_url}:{server_port}/{auth_audience}"
         if self.validation_mode:
             self.geoDB = None
+            self.access_token_cached = True
         else:
+            access_token = get_cached_access_token(self.token_cache_key)
             self.geoDB = GeoDBClient(
                 server_url=server_url,
                 server_port=server_port,
                 client_id=client_id,
                 client_secret=client_secret,
                 auth_aud=auth_audience,
+                access_token=access_token,
             )
+            self.access_token_cached = access_token is not None
+        self.access_token_checked = not self.access_token_cached
+
+    def check_access_token(self):
+        # a cached token may have been revoked, so before the first request which
+        # depends on it, it is tried with a harmless one and replaced if rejected
+        if self.access_token_checked:
+            return
+        self.access_token_checked = True
+        try:
+            self.geoDB.whoami
+        except GeoDBError:
+            drop_cached_access_token(self.token_cache_key)
+            self.geoDB.refresh_auth_access_token()
+            self.access_token_cached = False
+
+    def store_access_token(self):
+        # called after the client has been used, so the token has already been
+        # fetched; the client does not expose it publicly, so caching is skipped
+        # if its internals change
+        if self.access_token_cached:
+            return
+        self.access_token_cached = True
+        db_interface = getattr(self.geoDB, "_db_interface", None)
+        access_token = getattr(db_interface, "auth_access_token", None)
+        if isinstance(access_token, str):
+            cache_access_token(self.token_cache_key, access_token)
 
     def create_collection(self):
         properties = {
@@ -125,73 +462,75 @@ class Ingester:
                 SITES_COLLECTION, properties, database=DATABASE
             )
 
+    def insert_into_collection(self, collection: str, gdf: gpd.GeoDataFrame):
+        self.check_access_token()
+        # the geoDB client selects its chunks by index label, so rows following
+        # gaps left by the filtering of placeholder rows need a fresh index
+        self.geoDB.insert_into_collection(
+            collection,
+            gdf.reset_index(drop=True),
+            database=DATABASE,
+            crs=4326,
+            max_transfer_chunk_size=INSERT_CHUNK_SIZE,
+        )
+        self.store_access_token()
+
+    def close(self):
+        # releases the workbook files, which are kept open for all ingestion steps
+        for workbook in self.workbooks.values():
+            workbook.close()
+        self.workbooks = {}
+        self.session.close()
+
+    def open_workbook(self, calibration_site_xls: str) -> pd.ExcelFile:
+        # the workbook is read by several ingestion steps, parse it only once
+        if calibration_site_xls not in self.workbooks:
+            self.workbooks[calibration_site_xls] = pd.ExcelFile(
+                calibration_site_xls, engine=EXCEL_ENGINE
+            )
+        return self.workbooks[calibration_site_xls]
+
     def ingest_sites(
         self, calibration_site_xls: str, license_url: Optional[str] = None
     ) -> List[str]:
         sites_df = pd.read_excel(
-            calibration_site_xls,
+            self.open_workbook(calibration_site_xls),
             "site",
             skiprows=range(1, 5),
             converters={
                 "Active from  (YYYY-MM-DD)": str,
                 "Active from (YYYY-MM-DD)": str,
-                'Active until (YYYY-MM-DD or " - ")': str,
+                'Active until (YYYY-MM-DD or "-")': str,
                 "Planned maintenance schedule": lambda x: (
                     "Nothing" if x == "N/A" else x
                 ),
             },
         )
 
-        sites_df.rename(
-            columns={
-                "Short Site ID": "short_site_identifier",
-                "Country": "country",
-                "Site Name": "sitename",
-                "Province / state / region": "province_state_region",
-                "Primary Target Type ID": "primary_target_type_identifier",
-                "Target Types": "target_types",
-                "Primary Sensor": "primary_sensor",
-                "Willing to consider special requests": "special_requests",
-                "Responsible Organization": "responsible_organization",
-                "Website": "website",
-                "Active from  (YYYY-MM-DD)": "active_from",
-                "Active from (YYYY-MM-DD)": "active_from",
-                'Active until (YYYY-MM-DD or "-")': "active_until",
-                "POC Name": "poc_name",
-                "POC email": "poc_mail",
-                "Additional POC Name": "poc2_name",
-                "Additional POC email": "poc2_mail",
-                "Centroid of the site (latitude and longitude in decima deg)": "centroid",
-                "Boundaries": "boundaries",
-                "Planned maintenance schedule": "maintenance_schedule",
-                "Characteristics": "characteristics",
-            },
-            inplace=True,
-        )
+        sites_df.rename(columns=SITE_COLUMNS, inplace=True)
 
-        sites_df = sites_df[sites_df["Unique Site ID"] != "-"]
-        sites_df = sites_df.drop("Unique Site ID", axis=1)
+        sites_df = sites_df.loc[
+            sites_df["Unique Site ID"] != "-",
+            sites_df.columns.drop("Unique Site ID"),
+        ]
 
         self.validate_sites(sites_df)
         print("Successfully validated sites.")
         if self.validation_mode:
             return []
 
-        sites_df = sites_df.replace(to_replace=np.nan, value="")
-        sites_df = sites_df.replace(to_replace="-", value=None)
+        sites_df = replace_missing(sites_df, nan_value="", placeholder="-")
 
-        sites_df = sites_df.apply(compute_centroid_from_boundaries, axis=1)
+        # the boundaries are parsed once, for both the centroids and the geometry
+        boundaries = gpd.GeoSeries.from_wkt(sites_df["boundaries"], crs=4326)
+        sites_df = compute_centroids(sites_df, boundaries)
 
         sites_df.insert(len(sites_df.columns), "endorsement", "review")
-        sites_df.insert(len(sites_df.columns), "geometry", "POINT(0 0)")
         sites_df.insert(len(sites_df.columns), "license_url", license_url)
-        sites_df["geometry"] = gpd.GeoSeries.from_wkt(sites_df["boundaries"])
 
-        gdf = gpd.GeoDataFrame(sites_df, geometry="geometry", crs=4326)
+        gdf = gpd.GeoDataFrame(sites_df, geometry=boundaries, crs=4326)
         if len(gdf) > 0:
-            self.geoDB.insert_into_collection(
-                SITES_COLLECTION, gdf, database=DATABASE, crs=4326
-            )
+            self.insert_into_collection(SITES_COLLECTION, gdf)
             print(f"Successfully ingested {len(gdf)} sites.")
             return list(gdf["short_site_identifier"])
         else:
@@ -217,41 +556,37 @@ class Ingester:
             "maintenance_schedule",
             "characteristics",
         ]
-        for row in sites_df.iterrows():
-            for col in mandatory_fields:
-                if str(row[1][col]) == "nan":
-                    raise ValueError(
-                        f"Row {row[0] + 6}: missing entry for mandatory field "
-                        f"'{col}' in sheet 'site'. Please fill in all mandatory fields,"
-                        f" or remove the entire row. No site has been ingested into "
-                        f"the database."
-                    )
-            try:
-                dateutil.parser.parse(row[1]["active_from"])
-            except dateutil.parser.ParserError:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry for field 'active_from'.  in "
-                    f"sheet 'site'. Please provide a date or date and time expressed "
-                    f"in YYYY-MM-dd format (UTC). No site has been ingested into the database."
-                )
-            try:
-                active_until = row[1]["active_until"]
-                if active_until != "-":
-                    dateutil.parser.parse(active_until)
-            except dateutil.parser.ParserError:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry for field 'active_until'. in "
-                    f"sheet 'site'. Please provide a date or date and time expressed "
-                    f"in YYYY-MM-dd format (UTC), or provide '-'. "
-                    f"No site has been ingested into the database."
-                )
+        missing_field = find_missing_field(sites_df, mandatory_fields)
+        if missing_field:
+            row, col = missing_field
+            raise ValueError(
+                f"Row {row + 6}: missing entry for mandatory field "
+                f"'{col}' in sheet 'site'. Please fill in all mandatory fields,"
+                f" or remove the entire row. No site has been ingested into "
+                f"the database."
+            )
+        invalid = parse_dates(sites_df["active_from"]).isna()
+        if invalid.any():
+            raise ValueError(
+                f"Row {invalid.idxmax() + 6}: invalid entry for field 'active_from'. "
+                f" in sheet 'site'. Please provide a date or date and time expressed "
+                f"in YYYY-MM-dd format (UTC). No site has been ingested into the database."
+            )
+        active_until = sites_df["active_until"]
+        invalid = (active_until != "-") & parse_dates(active_until).isna()
+        if invalid.any():
+            raise ValueError(
+                f"Row {invalid.idxmax() + 6}: invalid entry for field 'active_until'."
+                f" in sheet 'site'. Please provide a date or date and time expressed "
+                f"in YYYY-MM-dd format (UTC), or provide '-'. "
+                f"No site has been ingested into the database."
+            )
 
     def ingest_targets(self, calibration_site_xls: str) -> str:
-        nat_targets_df = None
-        art_targets_df = None
-        try:
+        workbook = self.open_workbook(calibration_site_xls)
+        if "dt" in workbook.sheet_names:
             nat_targets_df = pd.read_excel(
-                calibration_site_xls,
+                workbook,
                 "dt",
                 skiprows=range(1, 5),
                 converters={
@@ -259,15 +594,10 @@ class Ingester:
                     'Stop Monitoring Period (YYYY-MM-DD or "-")': str,
                 },
             )
-        except ValueError:
-            art_targets_df = pd.read_excel(
-                calibration_site_xls, "cr", skiprows=range(1, 5)
-            )
-
-        if nat_targets_df is not None:
             self.ingest_nat_targets(nat_targets_df)
             return "natural"
-        elif art_targets_df is not None:
+        elif "cr" in workbook.sheet_names:
+            art_targets_df = pd.read_excel(workbook, "cr", skiprows=range(1, 5))
             self.ingest_art_targets(art_targets_df)
             return "artificial"
         else:
@@ -275,40 +605,22 @@ class Ingester:
             return "None"
 
     def ingest_nat_targets(self, targets_df: pd.DataFrame):
-        targets_df.rename(
-            columns={
-                "Unique Target ID": "unique_target_id",
-                "Short Site ID": "short_site_identifier",
-                "Site Name": "sitename",
-                "Sub-site": "subsite",
-                "Internal ID": "internal_id",
-                "Short Target ID": "short_target_id",
-                "Target Type ID": "target_type_id",
-                "Target description": "target_description",
-                "Bounding polygon (WKT, WGS84)": "geometry",
-                "Coverage (km2)": "coverage",
-                "Mask polygon (WKT, WGS84)": "mask_polygon",
-                "Start Monitoring Period (YYYY-MM-DD)": "period_start",
-                'Stop Monitoring Period (YYYY-MM-DD or "-")': "period_stop",
-            },
-            inplace=True,
-            errors="ignore",
-        )
+        targets_df.rename(columns=NAT_TARGET_COLUMNS, inplace=True, errors="ignore")
         targets_df = targets_df[targets_df["unique_target_id"] != "--"]
-        targets_df = targets_df.replace(math.nan, None)
-        targets_df = targets_df.replace(to_replace="-", value=None)
 
         self.validate_nat_targets(targets_df)
         print("Targets validation successful.")
         if self.validation_mode:
             return
 
-        gdf = gpd.GeoDataFrame(targets_df)
+        targets_df = replace_missing(targets_df, placeholder="-")
+
+        # the bounding polygons are given as WKT, parse them in a single pass
+        geometry = gpd.GeoSeries.from_wkt(targets_df["geometry"], crs=4326)
+        gdf = gpd.GeoDataFrame(targets_df, geometry=geometry)
 
         if len(gdf) > 0:
-            self.geoDB.insert_into_collection(
-                NAT_TARGETS_COLLECTION, gdf, database=DATABASE, crs=4326
-            )
+            self.insert_into_collection(NAT_TARGETS_COLLECTION, gdf)
             print(f"Successfully ingested {len(gdf)} targets.")
         else:
             print("No targets ingested.")
@@ -324,77 +636,38 @@ class Ingester:
             "period_start",
             "period_stop",
         ]
-        for row in nat_targets_df.iterrows():
-            for col in mandatory_fields:
-                if str(row[1][col]) == "nan":
-                    raise ValueError(
-                        f"Row {row[0] + 6}: missing entry for mandatory field "
-                        f"'{col}' in 'dt' sheet. Please fill in all mandatory fields, "
-                        f"or remove the entire row. No targets have been ingested into "
-                        f"the database."
-                    )
+        missing_field = find_missing_field(nat_targets_df, mandatory_fields)
+        if missing_field:
+            row, col = missing_field
+            raise ValueError(
+                f"Row {row + 6}: missing entry for mandatory field "
+                f"'{col}' in 'dt' sheet. Please fill in all mandatory fields, "
+                f"or remove the entire row. No targets have been ingested into "
+                f"the database."
+            )
 
     def ingest_art_targets(self, targets_df: pd.DataFrame):
-        targets_df.rename(
-            columns={
-                "Unique Target ID": "unique_target_id",
-                "Short Site ID": "short_site_identifier",
-                "Site Name": "sitename",
-                "Sub-site": "subsite",
-                "Internal ID": "internal_id",
-                "Short Target ID": "short_target_id",
-                "Target Type ID": "target_type_id",
-                "Target description": "target_description",
-                "Approximage Latitude\n(decimal deg, WGS84)": "apprx_latitude",
-                "Approximate Latitude\n(decimal deg, WGS84)": "apprx_latitude",
-                "Approximate Longitude\n(decimal deg WGS84)": "apprx_longitude",
-                "Approximate Longitude\n(decimal deg, WGS84)": "apprx_longitude",
-                "Approximate elevation\n(meters, WGS84)": "apprx_elevation",
-                "Approximate Azimuth angle\n(decimal deg)": "apprx_azimuth",
-                "Approximate Boresight angle\n(decimal deg)": "apprx_boresight",
-                "Primary direction": "primary_direction",
-                "Side length (m)": "side_length",
-                "Photo link": "photo_link",
-                "Operational": "operational",
-                "Manufacturer": "manufacturer",
-                "Purpose of target": "purpose",
-                "Reference RCS (dBm2)": "rcs",
-                "Reference RCS measurement sensor": "rcs_sensor",
-                "Reference RCS measurement expected accuracy (dB)": "rcs_accuracy",
-                "Reference RCS measurement boresite angle (decimal deg)": "rcs_angle",
-                "Reference RCS measurement wavelength (m)": "rcs_wavelength",
-                "Reference RCS measurement bandwidth (Hz)": "rcs_bandwidth",
-                "RCS accuracy determination method": "rcs_method",
-                "RCS angle dependency availablity": "rcs_angle_dependency",
-                "Composition": "composition",
-                "Characterization of reflector ": "characterization",
-                "Characterization of reflector": "characterization",
-            },
-            inplace=True,
-            errors="ignore",
-        )
+        targets_df.rename(columns=ART_TARGET_COLUMNS, inplace=True, errors="ignore")
         targets_df = targets_df[targets_df["unique_target_id"] != "--"]
-        targets_df = targets_df.replace(math.nan, None)
 
         self.validate_art_targets(targets_df)
         print("Targets validation successful.")
         if self.validation_mode:
             return
 
+        # build the points from plain float arrays, before the columns become
+        # object columns by replacing NaN with None
+        geometry = shapely.points(
+            pd.to_numeric(targets_df["apprx_longitude"]).to_numpy(np.float64),
+            pd.to_numeric(targets_df["apprx_latitude"]).to_numpy(np.float64),
+        )
+        targets_df = replace_missing(targets_df)
         self.upload_photos(targets_df)
 
-        gdf = gpd.GeoDataFrame(
-            targets_df,
-            geometry=gpd.points_from_xy(
-                targets_df.apprx_longitude, targets_df.apprx_latitude
-            ),
-            crs=4326,
-        )
+        gdf = gpd.GeoDataFrame(targets_df, geometry=geometry, crs=4326)
 
         if len(gdf) > 0:
-            self.geoDB.insert_into_collection(
-                TARGETS_COLLECTION, gdf, database=DATABASE, crs=4326
-            )
+            self.insert_into_collection(TARGETS_COLLECTION, gdf)
             print(f"Successfully ingested {len(gdf)} targets.")
         else:
             print("No targets ingested.")
@@ -415,117 +688,120 @@ class Ingester:
             "operational",
             "purpose",
         ]
-        for row in art_targets_df.iterrows():
-            for col in mandatory_fields:
-                if str(row[1][col]) == "nan":
-                    raise ValueError(
-                        f"Row {row[0] + 6}: missing entry for mandatory field "
-                        f"'{col}' in 'cr' sheet. Please fill in all mandatory fields, "
-                        f"or remove the entire row. No targets have been ingested into "
-                        f"the database."
-                    )
-            try:
-                float(row[1]["apprx_latitude"])
-            except ValueError:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry for mandatory field "
-                    f"'Approximate Latitude' in 'cr' sheet. Please enter a valid "
-                    f"floating point number. No targets have been ingested into the "
-                    f"database."
-                )
-            if row[1]["apprx_latitude"] < -90 or row[1]["apprx_latitude"] > 90:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry for mandatory field "
-                    f"'Approximate Latitude' in 'cr' sheet. Please enter a valid "
-                    f"floating point number > -90 and < 90. "
-                    f"No targets have been ingested into the database."
-                )
-            try:
-                float(row[1]["apprx_longitude"])
-            except ValueError:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry for mandatory field "
-                    f"'Approximate Longitude' in 'cr' sheet. Please enter a valid "
-                    f"floating point number. No targets have been ingested into the "
-                    f"database."
-                )
-            if row[1]["apprx_longitude"] < -180 or row[1]["apprx_longitude"] > 180:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry for mandatory field "
-                    f"'Approximate Longitude' in 'cr' sheet. Please enter a valid "
-                    f"floating point number > -180 and < 180. "
-                    f"No targets have been ingested into the database."
-                )
-            try:
-                float(row[1]["apprx_elevation"])
-            except ValueError:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry for mandatory field "
-                    f"'Approximate Elevation' in 'cr' sheet. Please enter a valid "
-                    f"floating point number. No targets have been ingested into the "
-                    f"database."
-                )
-            try:
-                float(row[1]["side_length"])
-                if row[1]["side_length"] <= 0:
-                    raise ValueError
-            except ValueError:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry for mandatory field "
-                    f"'Side Length' in 'cr' sheet. Please enter a valid "
-                    f"floating point number > 0. No targets have been ingested into the "
-                    f"database."
-                )
-            try:
-                if row[1]["rcs"]:
-                    float(row[1]["rcs"])
-            except ValueError:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry for field "
-                    f"'RCS' in 'cr' sheet. Please enter a valid "
-                    f"floating point number. No targets have been ingested into the "
-                    f"database."
-                )
-            try:
-                if row[1]["rcs_accuracy"]:
-                    float(row[1]["rcs_accuracy"])
-            except ValueError:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry for field "
-                    f"'Reference RCS measurement expected accuracy (dB)' in 'cr' "
-                    f"sheet. Please enter a valid floating point number. No target "
-                    f"has been ingested into the database."
-                )
-            try:
-                if row[1]["rcs_angle"]:
-                    float(row[1]["rcs_angle"])
-            except ValueError:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry for field "
-                    f"'Reference RCS measurement boresite angle (decimal deg)' in 'cr' "
-                    f"sheet. Please enter a valid floating point number. No target "
-                    f"has been ingested into the database."
-                )
-            try:
-                if row[1]["rcs_wavelength"] and row[1]["rcs_wavelength"] <= 0:
-                    raise ValueError
-            except ValueError:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry for field "
-                    f"'Reference RCS measurement wavelength (m)' in 'cr' "
-                    f"sheet. Please enter a valid floating point number > 0. No target "
-                    f"has been ingested into the database."
-                )
-            try:
-                if row[1]["rcs_bandwidth"] and row[1]["rcs_bandwidth"] <= 0:
-                    raise ValueError
-            except ValueError:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry for field "
-                    f"'Reference RCS measurement bandwidth (Hz)' in 'cr' "
-                    f"sheet. Please enter a valid floating point number > 0. No target "
-                    f"has been ingested into the database."
-                )
+        missing_field = find_missing_field(art_targets_df, mandatory_fields)
+        if missing_field:
+            row, col = missing_field
+            raise ValueError(
+                f"Row {row + 6}: missing entry for mandatory field "
+                f"'{col}' in 'cr' sheet. Please fill in all mandatory fields, "
+                f"or remove the entire row. No targets have been ingested into "
+                f"the database."
+            )
+        latitude = pd.to_numeric(art_targets_df["apprx_latitude"], errors="coerce")
+        invalid = latitude.isna()
+        if invalid.any():
+            raise ValueError(
+                f"Row {invalid.idxmax() + 6}: invalid entry for mandatory field "
+                f"'Approximate Latitude' in 'cr' sheet. Please enter a valid "
+                f"floating point number. No targets have been ingested into the "
+                f"database."
+            )
+        invalid = (latitude < -90) | (latitude > 90)
+        if invalid.any():
+            raise ValueError(
+                f"Row {invalid.idxmax() + 6}: invalid entry for mandatory field "
+                f"'Approximate Latitude' in 'cr' sheet. Please enter a valid "
+                f"floating point number > -90 and < 90. "
+                f"No targets have been ingested into the database."
+            )
+        longitude = pd.to_numeric(art_targets_df["apprx_longitude"], errors="coerce")
+        invalid = longitude.isna()
+        if invalid.any():
+            raise ValueError(
+                f"Row {invalid.idxmax() + 6}: invalid entry for mandatory field "
+                f"'Approximate Longitude' in 'cr' sheet. Please enter a valid "
+                f"floating point number. No targets have been ingested into the "
+                f"database."
+            )
+        invalid = (longitude < -180) | (longitude > 180)
+        if invalid.any():
+            raise ValueError(
+                f"Row {invalid.idxmax() + 6}: invalid entry for mandatory field "
+                f"'Approximate Longitude' in 'cr' sheet. Please enter a valid "
+                f"floating point number > -180 and < 180. "
+                f"No targets have been ingested into the database."
+            )
+        elevation = pd.to_numeric(art_targets_df["apprx_elevation"], errors="coerce")
+        invalid = elevation.isna()
+        if invalid.any():
+            raise ValueError(
+                f"Row {invalid.idxmax() + 6}: invalid entry for mandatory field "
+                f"'Approximate Elevation' in 'cr' sheet. Please enter a valid "
+                f"floating point number. No targets have been ingested into the "
+                f"database."
+            )
+        side_length = pd.to_numeric(art_targets_df["side_length"], errors="coerce")
+        invalid = ~(side_length > 0)
+        if invalid.any():
+            raise ValueError(
+                f"Row {invalid.idxmax() + 6}: invalid entry for mandatory field "
+                f"'Side Length' in 'cr' sheet. Please enter a valid "
+                f"floating point number > 0. No targets have been ingested into the "
+                f"database."
+            )
+
+        # the RCS fields are optional, so only the given entries are checked
+        rcs = art_targets_df["rcs"]
+        invalid = rcs.notna() & pd.to_numeric(rcs, errors="coerce").isna()
+        if invalid.any():
+            raise ValueError(
+                f"Row {invalid.idxmax() + 6}: invalid entry for field "
+                f"'RCS' in 'cr' sheet. Please enter a valid "
+                f"floating point number. No targets have been ingested into the "
+                f"database."
+            )
+        rcs_accuracy = art_targets_df["rcs_accuracy"]
+        invalid = (
+            rcs_accuracy.notna() & pd.to_numeric(rcs_accuracy, errors="coerce").isna()
+        )
+        if invalid.any():
+            raise ValueError(
+                f"Row {invalid.idxmax() + 6}: invalid entry for field "
+                f"'Reference RCS measurement expected accuracy (dB)' in 'cr' "
+                f"sheet. Please enter a valid floating point number. No target "
+                f"has been ingested into the database."
+            )
+        rcs_angle = art_targets_df["rcs_angle"]
+        invalid = rcs_angle.notna() & pd.to_numeric(rcs_angle, errors="coerce").isna()
+        if invalid.any():
+            raise ValueError(
+                f"Row {invalid.idxmax() + 6}: invalid entry for field "
+                f"'Reference RCS measurement boresite angle (decimal deg)' in 'cr' "
+                f"sheet. Please enter a valid floating point number. No target "
+                f"has been ingested into the database."
+            )
+        rcs_wavelength = art_targets_df["rcs_wavelength"]
+        invalid = rcs_wavelength.notna() & ~(
+            pd.to_numeric(rcs_wavelength, errors="coerce") > 0
+        )
+        if invalid.any():
+            raise ValueError(
+                f"Row {invalid.idxmax() + 6}: invalid entry for field "
+                f"'Reference RCS measurement wavelength (m)' in 'cr' "
+                f"sheet. Please enter a valid floating point number > 0. No target "
+                f"has been ingested into the database."
+            )
+        rcs_bandwidth = art_targets_df["rcs_bandwidth"]
+        invalid = rcs_bandwidth.notna() & ~(
+            pd.to_numeric(rcs_bandwidth, errors="coerce") > 0
+        )
+        if invalid.any():
+            raise ValueError(
+                f"Row {invalid.idxmax() + 6}: invalid entry for field "
+                f"'Reference RCS measurement bandwidth (Hz)' in 'cr' "
+                f"sheet. Please enter a valid floating point number > 0. No target "
+                f"has been ingested into the database."
+            )
 
     def create_surveys_collection(self):
         properties = {
@@ -549,6 +825,7 @@ class Ingester:
             "status_report": "varchar",
         }
 
+        self.check_access_token()
         if not self.geoDB.collection_exists(SURVEYS_COLLECTION, DATABASE):
             self.geoDB.create_collection(
                 SURVEYS_COLLECTION, properties, database=DATABASE
@@ -565,7 +842,7 @@ class Ingester:
 
     def ingest_nat_surveys(self, calibration_site_xls: str):
         surveys_df = pd.read_excel(
-            calibration_site_xls,
+            self.open_workbook(calibration_site_xls),
             "survey",
             skiprows=range(1, 5),
             converters={
@@ -575,100 +852,49 @@ class Ingester:
                 "Local Observation time (HH:MM)": str,
             },
         )
-        surveys_df.rename(
-            columns={
-                "Unique Target ID": "unique_target_id",
-                "Start Survey Period (YYYY-MM-DD)": "survey_start",
-                "Stop Survey Period (YYYY-MM-DD)": "survey_stop",
-                "Mission": "mission",
-                "Carrier Frequency (GHz)": "carrier_frequency",
-                "Polarization Channels": "polarization_channels",
-                "UTC Observation Time (HH:MM)": "observation_time_utc",
-                "Local Observation time (HH:MM)": "observation_time_local",
-                "Incidence Angle Range (min - max, in decimal deg)": "incidence_angle_range",
-                "Backscatter coefficient type": "backscatter_coefficient_type",
-                "Mean Backscatter Coefficient (dB)": "backscatter_coefficient_mean",
-                "Backscatter Coefficient Standard Deviation (dB)": "backscatter_coefficient_std",
-                "Reference Surface": "reference_surface",
-                "Samples": "samples",
-                "Relative Orbit": "relative_orbit",
-                "Orbit direction": "orbit_direction",
-                "Look side": "look_side",
-                "Acquisition Mode": "acquisition_mode",
-                "Beam ID": "beam_id",
-                "Scene identifier(s)": "scene_identifier",
-                "Query URL": "query_url",
-            },
-            inplace=True,
-            errors="ignore",
-        )
+        surveys_df.rename(columns=NAT_SURVEY_COLUMNS, inplace=True, errors="ignore")
 
         surveys_df = surveys_df[surveys_df["unique_target_id"] != ""]
-        surveys_df = surveys_df.replace(math.nan, None)
 
         self.validate_nat_surveys(surveys_df)
         print("Successfully validated surveys.")
         if self.validation_mode:
             return
 
-        surveys_df = surveys_df.replace(to_replace="-", value=None)
+        surveys_df = replace_missing(surveys_df, placeholder="-")
         surveys_df.insert(len(surveys_df.columns), "geometry", "POINT(0 0)")
         surveys_df["geometry"] = gpd.GeoSeries.from_wkt(surveys_df["geometry"])
         gdf = gpd.GeoDataFrame(surveys_df, geometry="geometry", crs=4326)
 
         if len(gdf) > 0:
-            self.geoDB.insert_into_collection(
-                NAT_SURVEYS_COLLECTION, gdf, database=DATABASE, crs=4326
-            )
+            self.insert_into_collection(NAT_SURVEYS_COLLECTION, gdf)
         else:
             print("No new surveys ingested.")
 
     def ingest_art_surveys(self, calibration_site_xls: str):
         surveys_df = pd.read_excel(
-            calibration_site_xls,
+            self.open_workbook(calibration_site_xls),
             "survey",
             skiprows=range(1, 5),
             converters={
                 "Survey date (YYYY-MM-DD)": str,
-                "GNSS measusement duration\n(hh:mm:ss)": str,
-                "GNSS measurement duration\n(hh:mm:ss)": str,
+                "GNSS measusement duration\n(hh:mm:ss)": format_duration,
+                "GNSS measurement duration\n(hh:mm:ss)": format_duration,
             },
         )
-        surveys_df.rename(
-            columns={
-                "Unique Target ID": "unique_target_id",
-                "Survey date (YYYY-MM-DD)": "survey_date",
-                "Latitude (decimal deg)": "lat",
-                "Longitude (decimal deg)": "lon",
-                "Elevation (m)": "elevation",
-                "Position accuracy (cm)": "position_accuracy",
-                "Coordinate Reference System (WKT or EPSG)": "coordinate_reference_system",
-                "Azimuth angle\n(decimal deg)": "azimuth_angle",
-                "Boresight angle\n(decimal deg)": "boresight_angle",
-                "Tilt (decimal deg)": "tilt",
-                "Pointing accuracy\n(decimal deg)": "accuracy",
-                "Fence": "fence",
-                "Measurement method": "measurement_method",
-                "Offset method": "offset_method",
-                "Applied corrections": "corrections",
-                "GNSS measusement duration\n(hh:mm:ss)": "duration",
-                "GNSS measurement duration\n(hh:mm:ss)": "duration",
-                "Photo link": "photo_link",
-                "Status report": "status_report",
-            },
-            inplace=True,
-            errors="ignore",
-        )
+        surveys_df.rename(columns=ART_SURVEY_COLUMNS, inplace=True, errors="ignore")
 
         surveys_df = surveys_df[surveys_df["unique_target_id"] != ""]
-        surveys_df = surveys_df.replace(math.nan, None)
-        surveys_df["elevation"] = surveys_df["elevation"].astype(float)
 
         self.validate_art_surveys(surveys_df)
         print("Surveys validation successful.")
         if self.validation_mode:
             return
 
+        # the validation ensures that all numeric fields hold numbers
+        numeric_df = surveys_df[ART_SURVEY_NUMERIC_FIELDS].apply(pd.to_numeric)
+        surveys_df = surveys_df.assign(**numeric_df.astype(float))
+        surveys_df = replace_missing(surveys_df)
         self.upload_photos(surveys_df)
 
         surveys_df.insert(len(surveys_df.columns), "geometry", "POINT(0 0)")
@@ -676,9 +902,7 @@ class Ingester:
         gdf = gpd.GeoDataFrame(surveys_df, geometry="geometry", crs=4326)
 
         if len(gdf) > 0:
-            self.geoDB.insert_into_collection(
-                SURVEYS_COLLECTION, gdf, database=DATABASE, crs=4326
-            )
+            self.insert_into_collection(SURVEYS_COLLECTION, gdf)
             print(f"Successful ingested {len(gdf)} surveys.")
         else:
             print("No new surveys ingested.")
@@ -686,52 +910,68 @@ class Ingester:
     def upload_photos(self, df: DataFrame):
         folder_id = self.get_folder_id("ext_pictures")
 
-        for i, row in df.iterrows():
-            if row["photo_link"]:
-                photo_link = row["photo_link"]
-                if photo_link.startswith("http"):
-                    a = urllib.parse.urlparse(photo_link)
-                    filename = os.path.basename(a.path)
-                    while os.path.exists(filename):
-                        identifier = "".join(
-                            random.choices(string.ascii_lowercase, k=8)
-                        )
-                        parts = filename.split(".")
-                        filename = f"{'.'.join(parts[:-1])}_{identifier}.{parts[-1]}"
-                    photo_response = requests.get(photo_link)
-                    with open(filename, "wb") as f:
-                        f.write(photo_response.content)
-                else:
-                    filename = photo_link
-
-                with open(filename, mode="rb") as photo_file:
-                    contents = photo_file.read()
-                print(f"Uploading {filename}...")
-
-                upload_response = requests.post(
+        photo_links = df["photo_link"].dropna()
+        photo_links = photo_links[photo_links != ""]
+        # a photo referenced by several targets or surveys is only uploaded once
+        new_links = [
+            photo_link
+            for photo_link in photo_links.unique()
+            if photo_link not in self.photo_urls
+        ]
+        # the uploads are bound by network latency, so they are run concurrently
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+            photo_urls = executor.map(
+                lambda photo_link: self.upload_photo(photo_link, folder_id), new_links
+            )
+            self.photo_urls.update(zip(new_links, photo_urls))
+        df.loc[photo_links.index, "photo_link"] = photo_links.map(self.photo_urls)
+
+    def upload_photo(self, photo_link: str, folder_id: str) -> str:
+        path = None
+        try:
+            if photo_link.startswith("http"):
+                a = urllib.parse.urlparse(photo_link)
+                filename = os.path.basename(a.path)
+                # download into a unique temporary file, so concurrent downloads
+                # of photos with the same name cannot overwrite each other
+                fd, path = tempfile.mkstemp(suffix=os.path.splitext(filename)[1])
+                with os.fdopen(fd, "wb") as f:
+                    with self.session.get(photo_link, stream=True) as photo_response:
+                        for chunk in photo_response.iter_content(chunk_size=1 << 16):
+                            f.write(chunk)
+            else:
+                filename = photo_link
+
+            print(f"Uploading {filename}...")
+            # passing the open file streams it instead of loading it into memory
+            with open(path or filename, mode="rb") as photo_file:
+                upload_response = self.session.post(
                     "https://www.sarcalnet.org/wp-json/wp/v2/media",
-                    auth=HTTPBasicAuth("thomas", self.admin_password),
+                    auth=self.wordpress_auth,
                     headers={
                         "Content-Disposition": f"attachment; filename={filename}",
                         "Content-Type": "multipart/form-data",
                     },
-                    data=contents,
+                    data=photo_file,
                 )
-                df.at[i, "photo_link"] = upload_response.json()["source_url"]
+        finally:
+            if path:
+                os.remove(path)
 
-                os.remove(filename)
-                if upload_response.status_code >= 300:
-                    raise ValueError(upload_response.content)
+        if upload_response.status_code >= 300:
+            raise ValueError(upload_response.content)
 
-                payload = {"folder": folder_id, "ids": upload_response.json()["id"]}
-                move_response = requests.post(
-                    f"https://www.sarcalnet.org/wp-json/filebird/public/v1/folder/set-attachment",
-                    headers={"Authorization": f"Bearer {self.filebird_token}"},
-                    json=payload,
-                )
+        payload = {"folder": folder_id, "ids": upload_response.json()["id"]}
+        move_response = self.session.post(
+            f"https://www.sarcalnet.org/wp-json/filebird/public/v1/folder/set-attachment",
+            headers=self.filebird_headers,
+            json=payload,
+        )
 
-                if move_response.status_code >= 300:
-                    raise ValueError(move_response.content)
+        if move_response.status_code >= 300:
+            raise ValueError(move_response.content)
+
+        return upload_response.json()["source_url"]
 
     def validate_nat_surveys(self, surveys_df):
         mandatory_fields = [
@@ -753,34 +993,38 @@ class Ingester:
             "acquisition_mode",
             "beam_id",
         ]
-        for row in surveys_df.iterrows():
-            for col in mandatory_fields:
-                if str(row[1][col]) == "nan":
-                    raise ValueError(
-                        f"Row {row[0] + 6}: missing entry for mandatory field "
-                        f"'{col}' in 'surveys' sheet. Please fill in all mandatory "
-                        f"fields, or remove the entire row. No surveys have been "
-                        f"ingested into the database."
-                    )
-            try:
-                dateutil.parser.parse(row[1]["survey_start"])
-            except dateutil.parser.ParserError:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry '{row[1]['survey_start']}' for mandatory field "
-                    f"'Survey start (YYYY-MM-DD)' in 'surveys' sheet. Please enter a "
-                    f"valid date. "
-                    f"No surveys have been ingested into the database."
-                )
-            try:
-                if row[1]["survey_stop"] != "-":
-                    dateutil.parser.parse(row[1]["survey_stop"])
-            except dateutil.parser.ParserError:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry '{row[1]['survey_stop']}' for mandatory field "
-                    f"'Stop Monitoring Period (YYYY-MM-DD or \"-\")' in 'surveys' sheet. Please enter a "
-                    f"valid date. "
-                    f"No surveys have been ingested into the database."
-                )
+        missing_field = find_missing_field(surveys_df, mandatory_fields)
+        if missing_field:
+            row, col = missing_field
+            raise ValueError(
+                f"Row {row + 6}: missing entry for mandatory field "
+                f"'{col}' in 'surveys' sheet. Please fill in all mandatory "
+                f"fields, or remove the entire row. No surveys have been "
+                f"ingested into the database."
+            )
+
+        survey_start = surveys_df["survey_start"]
+        invalid = survey_start.notna() & parse_dates(survey_start).isna()
+        if invalid.any():
+            row = invalid.idxmax()
+            raise ValueError(
+                f"Row {row + 6}: invalid entry '{survey_start[row]}' for mandatory field "
+                f"'Survey start (YYYY-MM-DD)' in 'surveys' sheet. Please enter a "
+                f"valid date. "
+                f"No surveys have been ingested into the database."
+            )
+        survey_stop = surveys_df["survey_stop"]
+        invalid = (
+            survey_stop.notna() & (survey_stop != "-") & parse_dates(survey_stop).isna()
+        )
+        if invalid.any():
+            row = invalid.idxmax()
+            raise ValueError(
+                f"Row {row + 6}: invalid entry '{survey_stop[row]}' for mandatory field "
+                f"'Stop Monitoring Period (YYYY-MM-DD or \"-\")' in 'surveys' sheet. Please enter a "
+                f"valid date. "
+                f"No surveys have been ingested into the database."
+            )
 
     def validate_art_surveys(self, surveys_df):
         mandatory_fields = [
@@ -799,51 +1043,78 @@ class Ingester:
             "measurement_method",
             "offset_method",
         ]
-        for row in surveys_df.iterrows():
-            for col in mandatory_fields:
-                if str(row[1][col]) == "nan":
-                    raise ValueError(
-                        f"Row {row[0] + 6}: missing entry for mandatory field "
-                        f"'{col}' in 'surveys' sheet. Please fill in all mandatory "
-                        f"fields, or remove the entire row. No surveys have been "
-                        f"ingested into the database."
-                    )
-            try:
-                dateutil.parser.parse(row[1]["survey_date"])
-            except dateutil.parser.ParserError:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry '{row[1]['survey_date']}' for mandatory field "
-                    f"'Survey date (YYYY-MM-DD)' in 'surveys' sheet. Please enter a "
-                    f"valid date. "
-                    f"No surveys have been ingested into the database."
-                )
-            if row[1]["lat"] < -90 or row[1]["lat"] > 90:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry '{row[1]['lat']}' for mandatory field "
-                    f"'Latitude (decimal deg)' in 'surveys' sheet. Please enter a "
-                    f"valid floating point number > -90 and < 90. "
-                    f"No surveys have been ingested into the database."
-                )
-            if row[1]["lon"] < -180 or row[1]["lon"] > 180:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry '{row[1]['lon']}' for mandatory field "
-                    f"'Longitude (decimal deg)' in 'surveys' sheet. Please enter a "
-                    f"valid floating point number > -180 and < 180. "
-                    f"No surveys have been ingested into the database."
-                )
-            if row[1]["position_accuracy"] <= 0:
-                raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry '{row[1]['position_accuracy']}' "
-                    f"for mandatory field 'Position accuracy (cm)' in 'surveys' sheet. Please enter a "
-                    f"valid floating point number > 0. "
-                    f"No surveys have been ingested into the database."
-                )
-            crs = row[1]["coordinate_reference_system"]
+        missing_field = find_missing_field(surveys_df, mandatory_fields)
+        if missing_field:
+            row, col = missing_field
+            raise ValueError(
+                f"Row {row + 6}: missing entry for mandatory field "
+                f"'{col}' in 'surveys' sheet. Please fill in all mandatory "
+                f"fields, or remove the entire row. No surveys have been "
+                f"ingested into the database."
+            )
+        survey_date = surveys_df["survey_date"]
+        invalid = survey_date.notna() & parse_dates(survey_date).isna()
+        if invalid.any():
+            row = invalid.idxmax()
+            raise ValueError(
+                f"Row {row + 6}: invalid entry '{survey_date[row]}' for mandatory field "
+                f"'Survey date (YYYY-MM-DD)' in 'surveys' sheet. Please enter a "
+                f"valid date. "
+                f"No surveys have been ingested into the database."
+            )
+        # the numeric fields are checked on a typed copy, so the messages can
+        # still show the entries as they were made
+        raw_numbers = surveys_df[ART_SURVEY_NUMERIC_FIELDS]
+        numbers = raw_numbers.apply(pd.to_numeric, errors="coerce")
+        invalid = raw_numbers.notna() & numbers.isna()
+        invalid_rows = invalid.any(axis=1)
+        if invalid_rows.any():
+            row = invalid_rows.idxmax()
+            col = invalid.loc[row].idxmax()
+            raise ValueError(
+                f"Row {row + 6}: invalid entry '{raw_numbers[col][row]}' for mandatory "
+                f"field '{col}' in 'surveys' sheet. Please enter a valid number. "
+                f"No surveys have been ingested into the database."
+            )
+        latitude = numbers["lat"]
+        invalid = ~latitude.between(-90, 90)
+        if invalid.any():
+            row = invalid.idxmax()
+            raise ValueError(
+                f"Row {row + 6}: invalid entry '{surveys_df['lat'][row]}' for mandatory field "
+                f"'Latitude (decimal deg)' in 'surveys' sheet. Please enter a "
+                f"valid floating point number > -90 and < 90. "
+                f"No surveys have been ingested into the database."
+            )
+        longitude = numbers["lon"]
+        invalid = ~longitude.between(-180, 180)
+        if invalid.any():
+            row = invalid.idxmax()
+            raise ValueError(
+                f"Row {row + 6}: invalid entry '{surveys_df['lon'][row]}' for mandatory field "
+                f"'Longitude (decimal deg)' in 'surveys' sheet. Please enter a "
+                f"valid floating point number > -180 and < 180. "
+                f"No surveys have been ingested into the database."
+            )
+        position_accuracy = numbers["position_accuracy"]
+        invalid = ~(position_accuracy > 0)
+        if invalid.any():
+            row = invalid.idxmax()
+            raise ValueError(
+                f"Row {row + 6}: invalid entry '{surveys_df['position_accuracy'][row]}' "
+                f"for mandatory field 'Position accuracy (cm)' in 'surveys' sheet. Please enter a "
+                f"valid floating point number > 0. "
+                f"No surveys have been ingested into the database."
+            )
+        # most surveys share the same CRS, so each distinct entry is parsed once
+        crs_entries = surveys_df["coordinate_reference_system"]
+        for crs in crs_entries.unique():
             try:
                 pyproj.CRS.from_user_input(crs)
             except pyproj.exceptions.CRSError:
+                row = (crs_entries == crs).idxmax()
                 raise ValueError(
-                    f"Row {row[0] + 6}: invalid entry '{crs}' for mandatory field "
+                    f"Row {row + 6}: invalid entry '{crs}' for mandatory field "
                     f"'Coordinate Reference System (WKT or EPSG)' in 'surveys' sheet. "
                     f"Please enter a valid WKT or EPSG (e.g. EPSG:4326). "
                     f"No surveys have been ingested into the database."
@@ -862,19 +1133,17 @@ class Ingester:
         if not target_name:
             target_name = os.path.basename(media_file)
 
-        with open(media_file, mode="rb") as file_handle:
-            contents = file_handle.read()
         print(f"Uploading {media_type} file {media_file}...")
-
-        upload_response = requests.post(
-            "https://www.sarcalnet.org/wp-json/wp/v2/media",
-            auth=HTTPBasicAuth("thomas", self.admin_password),
-            headers={
-                "Content-Disposition": f"attachment; filename={target_name}",
-                "Content-Type": "multipart/form-data",
-            },
-            data=contents,
-        )
+        with open(media_file, mode="rb") as file_handle:
+            upload_response = self.session.post(
+                "https://www.sarcalnet.org/wp-json/wp/v2/media",
+                auth=self.wordpress_auth,
+                headers={
+                    "Content-Disposition": f"attachment; filename={target_name}",
+                    "Content-Type": "multipart/form-data",
+                },
+                data=file_handle,
+            )
         if upload_response.status_code >= 300:
             raise ValueError(
                 f"Unable to upload {media_type} file, reason: "
@@ -882,32 +1151,36 @@ class Ingester:
             )
 
         payload = {"folder": folder_id, "ids": upload_response.json()["id"]}
-        move_response = requests.post(
+        move_response = self.session.post(
             f"https://www.sarcalnet.org/wp-json/filebird/public/v1/folder/set-attachment",
-            headers={"Authorization": f"Bearer {self.filebird_token}"},
+            headers=self.filebird_headers,
             json=payload,
         )
 
         if move_response.status_code >= 300:
             raise ValueError(
-                "Unable to move {type} file to correct folder, reason: "
+                f"Unable to move {media_type} file to correct folder, reason: "
                 + str(move_response.content)
             )
 
         return upload_response.json()["source_url"]
 
     def get_folder_id(self, folder_name: str) -> str:
-        folders_response = requests.get(
-            f"https://www.sarcalnet.org/wp-json/filebird/public/v1/folders",
-            headers={"Authorization": f"Bearer {self.filebird_token}"},
-        )
-        folder_id = None
-        for f in folders_response.json()["data"]["folders"]:
-            if f["text"] == folder_name:
-                folder_id = f["id"]
-        if not folder_id:
-            raise ValueError("Folder {folder_name} does not exist.")
-        return folder_id
+        # the folders are static, so they are fetched once for all lookups; the
+        # lock keeps concurrent uploads from fetching them twice
+        with self.folder_ids_lock:
+            if self.folder_ids is None:
+                folders_response = self.session.get(
+                    f"https://www.sarcalnet.org/wp-json/filebird/public/v1/folders",
+                    headers=self.filebird_headers,
+                )
+                self.folder_ids = {
+                    f["text"]: f["id"]
+                    for f in folders_response.json()["data"]["folders"]
+                }
+        if folder_name not in self.folder_ids:
+            raise ValueError(f"Folder {folder_name} does not exist.")
+        return self.folder_ids[folder_name]
 
     def upload_license(self, license_file: Optional[str] = None) -> Optional[str]:
         if self.validation_mode or not license_file:
@@ -921,18 +1194,33 @@ class Ingester:
         folder_id = self.get_folder_id("self_assessments")
         return self.upload_file(self_assessment_pdf, folder_id, "self assessment")
 
-    def upload_form(self, form: str, site_ids: List[str]):
+    def upload_form(self, form: str, site_ids: List[str]) -> Optional[str]:
         if self.validation_mode:
             return None
         folder_id = self.get_folder_id("submission_forms")
         target_name = "_".join(site_ids) + "-" + os.path.basename(form)
-        form_url = self.upload_file(form, folder_id, "submission form", target_name)
-        for site_id in site_ids:
-            self.geoDB.update_collection(
-                SITES_COLLECTION,
-                {"form_url": form_url},
-                f"short_site_identifier=eq.{site_id}",
+        return self.upload_file(form, folder_id, "submission form", target_name)
+
+    def link_form(self, form_url: str, site_ids: List[str]):
+        # the form is archived even if it only adds targets or surveys to
+        # existing sites, but then there are no sites to link it to
+        if self.validation_mode or not site_ids:
+            return None
+        self.check_access_token()
+        # a single update for all sites; the ids are quoted to allow commas, and
+        # backslashes and quotes within them are escaped as PostgREST expects
+        quoted_site_ids = ",".join(
+            urllib.parse.quote(
+                '"' + site_id.replace("\\", "\\\\").replace('"', '\\"') + '"',
+                safe="",
             )
+            for site_id in site_ids
+        )
+        self.geoDB.update_collection(
+            SITES_COLLECTION,
+            {"form_url": form_url},
+            f"short_site_identifier=in.({quoted_site_ids})",
+        )
 
 
 @click.command()
@@ -1014,12 +1302,29 @@ def ingest_calibration_info(
         filebird_token,
     )
 
-    license_url = ingester.upload_license(license_file)
-    site_ids = ingester.ingest_sites(calibration_site_xls, license_url)
-    target_type = ingester.ingest_targets(calibration_site_xls)
-    ingester.ingest_surveys(calibration_site_xls, target_type)
-    ingester.upload_self_assessment_file(self_assessment_pdf)
-    ingester.upload_form(calibration_site_xls, site_ids)
+    try:
+        license_url = ingester.upload_license(license_file)
+        site_ids = ingester.ingest_sites(calibration_site_xls, license_url)
+        target_type = ingester.ingest_targets(calibration_site_xls)
+        ingester.ingest_surveys(calibration_site_xls, target_type)
+        # the two uploads are independent, so they are run concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            uploads = [
+                executor.submit(
+                    ingester.upload_self_assessment_file, self_assessment_pdf
+                ),
+                executor.submit(ingester.upload_form, calibration_site_xls, site_ids),
+            ]
+        # both uploads have finished here; report every failure, not only the first,
+        # and only link the form to the sites if both succeeded
+        errors = [upload.exception() for upload in uploads if upload.exception()]
+        for error in errors[1:]:
+            print(f"Upload failed: {error}")
+        if errors:
+            raise errors[0]
+        ingester.link_form(uploads[1].result(), site_ids)
+    finally:
+        ingester.close()
 
 
 def validate_self_assessment_file(self_assessment_pdf: str):
@@ -1027,11 +1332,12 @@ def validate_self_assessment_file(self_assessment_pdf: str):
         "Please provide a valid self assessment file in PDF format, according to "
         "the template provided on https://www.sarcalnet.org/?page_id=1278."
     )
-    if not self_assessment_pdf.lower().endswith("pdf"):
+    path = Path(self_assessment_pdf)
+    if path.suffix.lower() != ".pdf":
         raise ValueError(
             f"{base_error_message}\nThe path {self_assessment_pdf} is not a pdf file."
         )
-    if not os.path.exists(self_assessment_pdf):
+    if not path.is_file():
         raise ValueError(
             f"{base_error_message}\nThe path {self_assessment_pdf} does not exist."
         )
@@ -1039,13 +1345,14 @@ def validate_self_assessment_file(self_assessment_pdf: str):
 
 def validate_license_file(license_file: str):
     if license_file:
-        if not license_file.lower().endswith("pdf"):
+        path = Path(license_file)
+        if path.suffix.lower() != ".pdf":
             raise ValueError(
-                "Please provide a valid signed license file in PDF"
+                "Please provide a valid signed license file in PDF "
                 "format, according to the directions provided on "
                 "https://www.sarcalnet.org/?page_id=1050."
             )
-        if not os.path.exists(license_file):
+        if not path.is_file():
             raise ValueError(f"The path {license_file} does not exist.")
 
 